@@ -0,0 +1,199 @@
+import math
+from datetime import datetime
+
+from common.config.anomaly_config import AnomalyConfig
+from sensor.model import SystemMetrics
+
+
+class EWMAStats:
+    """
+    Exponentially weighted mean and variance, updated in O(1) per sample
+    """
+
+    def __init__(self, alpha: float) -> None:
+        """
+        Arguments:
+            alpha: Smoothing factor in (0, 1], higher reacts faster
+
+        Returns:
+            None
+        """
+        self.alpha = alpha
+        self.mean = 0.0
+        self.var = 0.0
+        self.count = 0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.var)
+
+    def zscore(self, value: float, min_std: float) -> float:
+        """Z-score of value against the current mean/std (before updating)"""
+        return (value - self.mean) / max(self.std, min_std)
+
+    def update(self, value: float) -> None:
+        if self.count == 0:
+            self.mean = value
+        else:
+            diff = value - self.mean
+            incr = self.alpha * diff
+            self.mean += incr
+            self.var = (1 - self.alpha) * (self.var + diff * incr)
+        self.count += 1
+
+
+class HostAnomalyDetector:
+    """
+    Incremental anomaly detector for a single host
+
+    Keeps an EWMA z-score per metric and a smoothed disk fill rate used to
+    forecast the time until the disk is full.
+    """
+
+    def __init__(self, config: AnomalyConfig) -> None:
+        """
+        Arguments:
+            config: Anomaly detection configuration
+
+        Returns:
+            None
+        """
+        self.config = config
+        self.stats: dict[str, EWMAStats] = {}
+        self.disk_rate = EWMAStats(config.EWMA_ALPHA)
+        self.last_disk_used_gb: float | None = None
+        self.last_timestamp: datetime | None = None
+        # Consecutive samples each finding has held for
+        self.streaks: dict[str, int] = {}
+        # Recent alerts: key -> (severity, time) when last alerted
+        self.alerted: dict[str, tuple[float, datetime]] = {}
+
+    def update(self, metrics: SystemMetrics) -> dict[str, float]:
+        """
+        Feed one sample and return any findings worth alerting on
+
+        A finding is reported once it has held for `PERSIST_SAMPLES`
+        consecutive samples, then again only when it gets worse (higher
+        z-score, or disk ETA halved) or `ALERT_COOLDOWN_SECONDS` after the
+        last alert, even if it ended and came back in between.
+
+        Returns:
+            Findings keyed like the static alerts: `<metric>_anomaly` holds
+            the current reading, `disk_full_eta_min` the minutes until full
+        """
+        findings = {}
+        severities = {}
+
+        for key, value in metrics.metric_values().items():
+            stats = self.stats.setdefault(key, EWMAStats(self.config.EWMA_ALPHA))
+            if stats.count >= self.config.WARMUP_SAMPLES:
+                zscore = abs(stats.zscore(value, self.config.MIN_STD))
+                if zscore > self.config.Z_THRESHOLD:
+                    findings[f"{key}_anomaly"] = value
+                    severities[f"{key}_anomaly"] = zscore
+                    # Keep the baseline out of a finding that is still building
+                    # up, so a real level shift is not absorbed before it alerts
+                    streak = self.streaks.get(f"{key}_anomaly", 0) + 1
+                    if streak < self.config.PERSIST_SAMPLES:
+                        continue
+            stats.update(value)
+
+        eta = self._update_disk_forecast(metrics)
+        if eta is not None and eta <= self.config.DISK_FULL_HORIZON_MINUTES:
+            findings["disk_full_eta_min"] = round(eta, 1)
+            # Halving the ETA doubles the severity
+            severities["disk_full_eta_min"] = 1 / max(eta, 1e-6)
+
+        return self._suppress(findings, severities, self.last_timestamp)
+
+    def _suppress(
+        self,
+        findings: dict[str, float],
+        severities: dict[str, float],
+        now: datetime | None,
+    ) -> dict[str, float]:
+        """Debounce findings, re-alerting only when worse or after cooldown"""
+        if now is None:
+            now = datetime.now()
+
+        # Single-sample spikes never alert
+        self.streaks = {key: self.streaks.get(key, 0) + 1 for key in findings}
+
+        # Alerts stay suppressed for the cooldown even if the finding ended
+        for key, (_, last_time) in list(self.alerted.items()):
+            if (now - last_time).total_seconds() >= self.config.ALERT_COOLDOWN_SECONDS:
+                del self.alerted[key]
+
+        alerts = {}
+        for key, value in findings.items():
+            if self.streaks[key] < self.config.PERSIST_SAMPLES:
+                continue
+            severity = severities[key]
+            previous = self.alerted.get(key)
+            if previous is not None:
+                last_severity, last_time = previous
+                worse = (
+                    severity >= last_severity * 2
+                    if key == "disk_full_eta_min"
+                    else severity >= last_severity + 1
+                )
+                if not worse:
+                    continue
+            alerts[key] = value
+            self.alerted[key] = (severity, now)
+
+        return alerts
+
+    def _update_disk_forecast(self, metrics: SystemMetrics) -> float | None:
+        """Update the disk fill rate and return minutes until full, if filling"""
+        try:
+            timestamp = datetime.fromisoformat(metrics.timestamp)
+        except ValueError:
+            return None
+
+        used_gb = metrics.disk.used_gb
+        last_used_gb, last_timestamp = self.last_disk_used_gb, self.last_timestamp
+        self.last_disk_used_gb, self.last_timestamp = used_gb, timestamp
+
+        if last_used_gb is None or last_timestamp is None:
+            return None
+
+        elapsed = (timestamp - last_timestamp).total_seconds()
+        if elapsed <= 0:
+            return None
+
+        self.disk_rate.update((used_gb - last_used_gb) / elapsed)
+        if self.disk_rate.count < self.config.WARMUP_SAMPLES:
+            return None
+
+        rate = self.disk_rate.mean
+        if rate <= 0:
+            return None
+        return metrics.disk.free_gb / rate / 60
+
+
+class AnomalyDetector:
+    """
+    Per-host streaming anomaly detection alongside the static thresholds
+    """
+
+    def __init__(self, config: AnomalyConfig | None = None) -> None:
+        """
+        Arguments:
+            config: Anomaly detection configuration (defaults to env config)
+
+        Returns:
+            None
+        """
+        self.config = config or AnomalyConfig()
+        self.hosts: dict[str, HostAnomalyDetector] = {}
+
+    def update(self, metrics: SystemMetrics) -> dict[str, float] | None:
+        host = metrics.hostname or "unknown"
+        detector = self.hosts.get(host)
+        if detector is None:
+            detector = self.hosts[host] = HostAnomalyDetector(self.config)
+
+        findings = detector.update(metrics)
+        if findings:
+            return findings
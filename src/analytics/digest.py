@@ -0,0 +1,134 @@
+import threading
+import time
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from sensor.model import SystemMetrics
+
+
+class MetricSummary(BaseModel):
+    min: float = Field(..., description="Minimum value in the window")
+    avg: float = Field(..., description="Sample-interval weighted average")
+    max: float = Field(..., description="Maximum value in the window")
+
+
+class HostDigest(BaseModel):
+    hostname: str = Field(..., description="Hostname of the producer")
+    samples: int = Field(..., description="Number of samples in the window")
+    metrics: dict[str, MetricSummary] = Field(..., description="Summary per metric")
+
+    def peak(self) -> tuple[str, float]:
+        """Metric with the highest maximum in the window"""
+        key = max(self.metrics, key=lambda k: self.metrics[k].max)
+        return key, self.metrics[key].max
+
+
+class WindowDigest(BaseModel):
+    start: str = Field(..., description="Window start in ISO format")
+    end: str = Field(..., description="Window end in ISO format")
+    hosts: list[HostDigest] = Field(..., description="Summary per host")
+
+    def fleet_averages(self) -> dict[str, float]:
+        """Average of the per-host averages for each metric"""
+        totals: dict[str, list[float]] = {}
+        for host in self.hosts:
+            for key, summary in host.metrics.items():
+                totals.setdefault(key, []).append(summary.avg)
+        return {key: round(sum(avgs) / len(avgs), 2) for key, avgs in totals.items()}
+
+    def top_offenders(self, count: int) -> list[HostDigest]:
+        """Hosts with the highest peak metric value"""
+        hosts = [host for host in self.hosts if host.metrics]
+        return sorted(hosts, key=lambda host: host.peak()[1], reverse=True)[:count]
+
+
+class MetricWindow:
+    """
+    Running min/avg/max of one metric, O(1) memory
+    """
+
+    def __init__(self) -> None:
+        self.min = float("inf")
+        self.max = float("-inf")
+        self.weighted_sum = 0.0
+        self.weight = 0.0
+
+    def add(self, value: float, weight: float) -> None:
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.weighted_sum += value * weight
+        self.weight += weight
+
+    def summary(self) -> MetricSummary:
+        return MetricSummary(
+            min=self.min,
+            avg=round(self.weighted_sum / self.weight, 2),
+            max=self.max,
+        )
+
+
+class DigestBuilder:
+    """
+    Accumulates per-host metric windows as samples stream in
+
+    Samples are weighted by `sample_interval_seconds` so hosts sampled faster
+    during incidents do not skew the averages.
+    """
+
+    def __init__(self, window_seconds: float) -> None:
+        """
+        Arguments:
+            window_seconds: Length of each reporting window
+
+        Returns:
+            None
+        """
+        self.window_seconds = window_seconds
+        self.lock = threading.Lock()
+        self._reset()
+
+    def add(self, metrics: SystemMetrics) -> None:
+        weight = metrics.sample_interval_seconds or 1.0
+        host = metrics.hostname or "unknown"
+
+        with self.lock:
+            windows = self.hosts.setdefault(host, {})
+            for key, value in metrics.metric_values().items():
+                windows.setdefault(key, MetricWindow()).add(value, weight)
+            self.samples[host] = self.samples.get(host, 0) + 1
+
+    def flush(self) -> WindowDigest | None:
+        """
+        Close the window if it has elapsed
+
+        Returns:
+            Digest of the closed window, or None if it is still open or empty
+        """
+        if time.time() - self.window_start < self.window_seconds:
+            return None
+
+        with self.lock:
+            hosts, samples, start = self.hosts, self.samples, self.window_start
+            self._reset()
+
+        if not hosts:
+            return None
+
+        return WindowDigest(
+            start=datetime.fromtimestamp(start).isoformat(),
+            end=datetime.now().isoformat(),
+            hosts=[
+                HostDigest(
+                    hostname=host,
+                    samples=samples[host],
+                    metrics={key: window.summary() for key, window in windows.items()},
+                )
+                for host, windows in sorted(hosts.items())
+            ],
+        )
+
+    def _reset(self) -> None:
+        self.hosts: dict[str, dict[str, MetricWindow]] = {}
+        self.samples: dict[str, int] = {}
+        self.window_start = time.time()
@@ -0,0 +1,17 @@
+import os
+
+
+class AnomalyConfig:
+    """Streaming anomaly detection configuration"""
+
+    EWMA_ALPHA = float(os.getenv("ANOMALY_EWMA_ALPHA", 0.1))
+    Z_THRESHOLD = float(os.getenv("ANOMALY_Z_THRESHOLD", 3.0))
+    WARMUP_SAMPLES = int(os.getenv("ANOMALY_WARMUP_SAMPLES", 10))
+    MIN_STD = float(os.getenv("ANOMALY_MIN_STD", 1.0))
+    DISK_FULL_HORIZON_MINUTES = float(
+        os.getenv("ANOMALY_DISK_FULL_HORIZON_MINUTES", 60)
+    )
+    # A finding must hold for this many consecutive samples before it alerts
+    PERSIST_SAMPLES = int(os.getenv("ANOMALY_PERSIST_SAMPLES", 3))
+    # Re-send an ongoing finding after this long even if it did not get worse
+    ALERT_COOLDOWN_SECONDS = float(os.getenv("ANOMALY_ALERT_COOLDOWN_SECONDS", 900))
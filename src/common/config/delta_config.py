@@ -0,0 +1,30 @@
+import json
+import os
+
+
+class DeltaConfig:
+    """Delta-encoded publishing configuration"""
+
+    ENABLED = os.getenv("DELTA_PUBLISHING", "false").lower() == "true"
+    KEYFRAME_INTERVAL_SECONDS = float(os.getenv("DELTA_KEYFRAME_INTERVAL_SECONDS", 60))
+
+    # Deadband per leaf field name: changes within it are not published
+    DEADBANDS: dict[str, float] = {
+        "usage_percent": 1.0,
+        "usage_per_core": 5.0,
+        "frequency_mhz": 50.0,
+        "load_percent": 1.0,
+        "memory_usage_percent": 1.0,
+        "total_gb": 0.1,
+        "available_gb": 0.1,
+        "used_gb": 0.1,
+        "free_gb": 0.1,
+        "memory_used_gb": 0.1,
+        "memory_total_gb": 0.1,
+        "temperature_c": 1.0,
+        "cpu_percent": 0.5,
+        "cpu_ms": 5.0,
+        "rss_mb": 1.0,
+        "rss_delta_kb": 64.0,
+        **json.loads(os.getenv("DELTA_DEADBANDS", "{}")),
+    }
@@ -12,3 +12,7 @@ class MongoDBConfig:
     DATABASE = os.getenv("MONGODB_DATABASE", "protexai")
     COLLECTION = os.getenv("MONGODB_COLLECTION", "metrics")
     SERVER_SELECTION_TIMEOUT_MS = 5000
+    RETRY_QUEUE_SIZE = int(os.getenv("MONGODB_RETRY_QUEUE_SIZE", 1000))
+    RETRY_BATCH_SIZE = int(os.getenv("MONGODB_RETRY_BATCH_SIZE", 500))
+    RETRY_INTERVAL_SECONDS = float(os.getenv("MONGODB_RETRY_INTERVAL_SECONDS", 5))
+    DEAD_LETTER_PATH = os.getenv("MONGODB_DEAD_LETTER_PATH", "./dead_letter.jsonl")
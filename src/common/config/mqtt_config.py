@@ -8,4 +8,12 @@ class MQTTConfig:
     BROKER_PORT = int(os.getenv("MQTT_BROKER_PORT", "1883"))
     TOPIC = os.getenv("MQTT_TOPIC", "test/topic")
     KEEPALIVE = 60
-    QOS = 0
+    # Stable consumer id: the broker keeps its session and queues QoS 1
+    # messages while it is disconnected (random id and clean session if unset)
+    CONSUMER_CLIENT_ID = os.getenv("MQTT_CONSUMER_CLIENT_ID", "")
+    QOS = int(os.getenv("MQTT_QOS", "0"))
+    MAX_INFLIGHT = int(os.getenv("MQTT_MAX_INFLIGHT", "20"))
+    MAX_QUEUED = int(os.getenv("MQTT_MAX_QUEUED", "1000"))
+    CONNECT_TIMEOUT_SECONDS = float(os.getenv("MQTT_CONNECT_TIMEOUT_SECONDS", 10))
+    RECONNECT_MIN_DELAY_SECONDS = int(os.getenv("MQTT_RECONNECT_MIN_DELAY_SECONDS", 1))
+    RECONNECT_MAX_DELAY_SECONDS = int(os.getenv("MQTT_RECONNECT_MAX_DELAY_SECONDS", 60))
@@ -0,0 +1,13 @@
+import os
+
+
+class OverheadConfig:
+    """Producer self-overhead budget configuration"""
+
+    # Producer CPU time as a percentage of one core over wall-clock time
+    BUDGET_PERCENT = float(os.getenv("PRODUCER_OVERHEAD_BUDGET_PERCENT", 2.0))
+    # Restore degraded collectors once overhead falls below this share of the budget
+    RECOVERY_RATIO = float(os.getenv("PRODUCER_OVERHEAD_RECOVERY_RATIO", 0.5))
+    # Collectors that would run less often than every MAX_STRIDE samples are disabled
+    MAX_STRIDE = int(os.getenv("PRODUCER_OVERHEAD_MAX_STRIDE", 16))
+    EWMA_ALPHA = 0.3
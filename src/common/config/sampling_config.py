@@ -0,0 +1,17 @@
+import os
+
+
+class SamplingConfig:
+    """Producer sampling configuration"""
+
+    INTERVAL_SECONDS = float(os.getenv("RUN_INTERVAL_SECONDS", 5))
+    ADAPTIVE = os.getenv("ADAPTIVE_SAMPLING", "false").lower() == "true"
+    MIN_INTERVAL_SECONDS = float(os.getenv("SAMPLING_MIN_INTERVAL_SECONDS", 1))
+    MAX_INTERVAL_SECONDS = float(os.getenv("SAMPLING_MAX_INTERVAL_SECONDS", 60))
+    BACKOFF_FACTOR = float(os.getenv("SAMPLING_BACKOFF_FACTOR", 1.5))
+    # Sample fast once a metric is within this many points of CRITICAL_THRESHOLD
+    # and rose by at least RISE_THRESHOLD points since the previous sample
+    APPROACH_MARGIN = float(os.getenv("SAMPLING_APPROACH_MARGIN", 15))
+    RISE_THRESHOLD = float(os.getenv("SAMPLING_RISE_THRESHOLD", 1))
+    # ...or moved by at least this many points since the previous sample
+    CHANGE_THRESHOLD = float(os.getenv("SAMPLING_CHANGE_THRESHOLD", 10))
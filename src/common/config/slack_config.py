@@ -12,3 +12,4 @@ class SlackConfig:
     CHANNEL = os.getenv("SLACK_CHANNEL", "#notifs")
     ALERT_CHANNEL = os.getenv("SLACK_ALERT_CHANNEL", "#alerts")
     SEND_DURATION_SECONDS = float(os.getenv("SLACK_SEND_DURATION_SECONDS", 60))
+    DIGEST_TOP_N = int(os.getenv("SLACK_DIGEST_TOP_N", 3))
@@ -1,7 +1,7 @@
 import logging
-import time
+import threading
 from types import TracebackType
-from typing import Callable, Type
+from typing import Any, Callable, Type
 
 import paho.mqtt.client as mqtt
 from paho.mqtt.enums import CallbackAPIVersion
@@ -20,6 +20,8 @@ class MQTTClient:
         logger: logging.Logger,
         on_message: Callable | None = None,
         loop_forever: bool = False,
+        topics: list[str] | None = None,
+        clean_session: bool = True,
     ) -> None:
         """
         Arguments:
@@ -27,6 +29,9 @@ class MQTTClient:
             logger: Logger instance
             on_message: Optional callback for message reception (for consumers)
             loop_forever: If True, start loop_forever(), otherwise use loop_start()
+            topics: Topics to subscribe to, restored on every (re)connect
+            clean_session: If False, the broker keeps the session (subscriptions
+                and queued QoS 1 messages) while the client is disconnected
 
         Returns:
             None
@@ -35,8 +40,44 @@ class MQTTClient:
         self.logger = logger
         self.on_message = on_message
         self.loop_forever = loop_forever
+        self.clean_session = clean_session
         self.client = None
         self.config = MQTTConfig()
+        self.subscriptions: dict[str, int] = {
+            topic: self.config.QOS for topic in topics or []
+        }
+        self.connected = threading.Event()
+        self.connect_error: str | None = None
+
+    def _on_connect(
+        self,
+        client: mqtt.Client,
+        _userdata: Any,
+        _flags: mqtt.ConnectFlags,
+        reason_code: mqtt.ReasonCode,
+        _properties: mqtt.Properties | None,
+    ) -> None:
+        if reason_code.is_failure:
+            self.connect_error = str(reason_code)
+            self.logger.error(f"MQTT connection refused: {reason_code}")
+        else:
+            self.connect_error = None
+            self.logger.info("Connected to MQTT broker")
+            if self.subscriptions:
+                client.subscribe(list(self.subscriptions.items()))
+                self.logger.info(f"Subscribed to {list(self.subscriptions)}")
+        self.connected.set()
+
+    def _on_disconnect(
+        self,
+        _client: mqtt.Client,
+        _userdata: Any,
+        _flags: mqtt.DisconnectFlags,
+        reason_code: mqtt.ReasonCode,
+        _properties: mqtt.Properties | None,
+    ) -> None:
+        self.connected.clear()
+        self.logger.warning(f"Disconnected from MQTT broker: {reason_code}")
 
     def __enter__(self) -> mqtt.Client:
         """
@@ -48,10 +89,17 @@ class MQTTClient:
         self.client = mqtt.Client(
             callback_api_version=CallbackAPIVersion.VERSION2,
             client_id=self.client_id,
+            clean_session=self.clean_session,
         )
 
         if self.on_message:
             self.client.on_message = self.on_message
+        self.client.on_connect = self._on_connect
+        self.client.on_disconnect = self._on_disconnect
+        self.client.reconnect_delay_set(
+            min_delay=self.config.RECONNECT_MIN_DELAY_SECONDS,
+            max_delay=self.config.RECONNECT_MAX_DELAY_SECONDS,
+        )
 
         try:
             self.logger.info(
@@ -68,13 +116,20 @@ class MQTTClient:
             else:
                 self.client.loop_start()
 
-            time.sleep(2)
-            self.logger.info("Connected to MQTT broker")
+            # Wait for CONNACK instead of sleeping a fixed amount of time
+            if not self.connected.wait(self.config.CONNECT_TIMEOUT_SECONDS):
+                raise TimeoutError(
+                    f"No CONNACK within {self.config.CONNECT_TIMEOUT_SECONDS}s"
+                )
+            if self.connect_error:
+                raise ConnectionError(self.connect_error)
 
             return self.client
 
         except Exception as e:
             self.logger.error(f"Failed to connect: {e}")
+            if not self.loop_forever:
+                self.client.loop_stop()
             raise
 
     def __exit__(
@@ -0,0 +1,116 @@
+import logging
+import threading
+import time
+from typing import Any
+
+import paho.mqtt.client as mqtt
+
+from common.config.mqtt_config import MQTTConfig
+
+
+class MQTTPublisher:
+    """
+    Publisher with a bounded in-flight window and asynchronous ack tracking
+
+    Uses paho's in-flight window (`MAX_INFLIGHT`) and message queue
+    (`MAX_QUEUED`) so QoS 1 publishing does not block on each PUBACK, and
+    records publish-to-ack latency from `on_publish`.
+    """
+
+    def __init__(
+        self, client: mqtt.Client, logger: logging.Logger, qos: int | None = None
+    ) -> None:
+        """
+        Arguments:
+            client: Connected MQTT client (see MQTTClient)
+            logger: Logger instance
+            qos: QoS level (default: MQTTConfig.QOS)
+
+        Returns:
+            None
+        """
+        self.client = client
+        self.logger = logger
+        self.config = MQTTConfig()
+        self.qos = self.config.QOS if qos is None else qos
+
+        self.pending: dict[int, float] = {}
+        self.early_acks: set[int] = set()
+        self.condition = threading.Condition()
+        self.acked = 0
+        self.latency_avg_ms = 0.0
+        self.latency_max_ms = 0.0
+
+        self.client.max_inflight_messages_set(self.config.MAX_INFLIGHT)
+        self.client.max_queued_messages_set(self.config.MAX_QUEUED)
+        self.client.on_publish = self._on_publish
+
+    def publish(self, topic: str, payload: str) -> bool:
+        """
+        Queue a message for delivery without waiting for the ack
+
+        Returns:
+            True if the message was accepted for delivery
+        """
+        sent = time.monotonic()
+        info = self.client.publish(topic, payload, qos=self.qos)
+        # QoS > 0 messages published while disconnected are sent on reconnect
+        queued = info.rc == mqtt.MQTT_ERR_NO_CONN and self.qos > 0
+        if info.rc != mqtt.MQTT_ERR_SUCCESS and not queued:
+            self.logger.error(f"Publish failed: {mqtt.error_string(info.rc)}")
+            return False
+
+        with self.condition:
+            # on_publish may run on the network thread before publish() returns
+            if info.mid in self.early_acks:
+                self.early_acks.discard(info.mid)
+                self._record_ack(sent)
+            else:
+                self.pending[info.mid] = sent
+        return True
+
+    def flush(self, timeout: float) -> bool:
+        """
+        Wait until every published message has been acknowledged
+
+        Returns:
+            True if nothing is left in flight
+        """
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.pending, timeout)
+
+    def stats(self) -> dict[str, float]:
+        with self.condition:
+            return {
+                "in_flight": len(self.pending),
+                "acked": self.acked,
+                "ack_latency_avg_ms": round(self.latency_avg_ms, 2),
+                "ack_latency_max_ms": round(self.latency_max_ms, 2),
+            }
+
+    def _on_publish(
+        self,
+        _client: mqtt.Client,
+        _userdata: Any,
+        mid: int,
+        reason_code: mqtt.ReasonCode,
+        _properties: mqtt.Properties | None,
+    ) -> None:
+        if reason_code.is_failure:
+            self.logger.error(f"Publish {mid} rejected by broker: {reason_code}")
+
+        with self.condition:
+            sent = self.pending.pop(mid, None)
+            if sent is None:
+                self.early_acks.add(mid)
+            else:
+                self._record_ack(sent)
+            self.condition.notify_all()
+
+    def _record_ack(self, sent: float) -> None:
+        """Update latency stats (caller holds the lock)"""
+        latency_ms = (time.monotonic() - sent) * 1000
+        self.acked += 1
+        # Cumulative average for the first 100 acks, then a moving average
+        self.latency_avg_ms += (latency_ms - self.latency_avg_ms) / min(self.acked, 100)
+        self.latency_max_ms = max(self.latency_max_ms, latency_ms)
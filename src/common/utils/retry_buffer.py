@@ -0,0 +1,242 @@
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from bson import ObjectId, json_util
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError
+
+from common.config.mongodb_config import MongoDBConfig
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+class RetryBuffer:
+    """
+    Bounded retry queue for MongoDB writes with an on-disk dead-letter log
+
+    Documents that could not be written are kept in memory up to
+    `RETRY_QUEUE_SIZE`; once full, the oldest ones are appended to the
+    dead-letter log. Both are drained in bulk once MongoDB is reachable again.
+    """
+
+    def __init__(self, logger: logging.Logger) -> None:
+        """
+        Arguments:
+            logger: Logger instance
+
+        Returns:
+            None
+        """
+        self.logger = logger
+        self.config = MongoDBConfig()
+        self.queue: deque[dict] = deque()
+        # Documents taken out of the queue or log by a drain that is in progress
+        self.in_flight = 0
+        self.lock = threading.Lock()
+        self.dead_letter_path = Path(self.config.DEAD_LETTER_PATH)
+        self.dead_letter_count = self._count_dead_letters()
+        self.last_drain = 0.0
+
+        if self.dead_letter_count:
+            self.logger.warning(
+                f"Found {self.dead_letter_count} documents in dead-letter log {self.dead_letter_path}"
+            )
+
+    @property
+    def backlog_size(self) -> int:
+        return len(self.queue) + self.dead_letter_count + self.in_flight
+
+    def insert(self, collection: Collection | None, document: dict) -> None:
+        """
+        Insert a document, buffering it if MongoDB is unavailable
+
+        Arguments:
+            collection: MongoDB collection (None buffers the document)
+            document: Document to insert
+        """
+        # Assign the id up front (unless the caller did) so a retried write
+        # cannot create a duplicate
+        document.setdefault("_id", ObjectId())
+
+        if collection is not None and not self.backlog_size:
+            try:
+                collection.insert_one(document)
+                return
+            except DuplicateKeyError:
+                # Redelivered message, already stored
+                return
+            except PyMongoError as e:
+                self.logger.error(f"Failed to store to MongoDB, buffering: {e}")
+
+        self._enqueue(document)
+
+    def drain(self, collection: Collection | None, force: bool = False) -> None:
+        """
+        Flush buffered documents to MongoDB in bulk
+
+        Arguments:
+            collection: MongoDB collection
+            force: Drain even if RETRY_INTERVAL_SECONDS has not elapsed
+        """
+        if collection is None or not self.backlog_size:
+            return
+        if (
+            not force
+            and time.time() - self.last_drain < self.config.RETRY_INTERVAL_SECONDS
+        ):
+            return
+        self.last_drain = time.time()
+
+        try:
+            # Fail fast while MongoDB is down instead of moving the log around
+            collection.database.client.admin.command("ping")
+            self._drain_dead_letters(collection)
+            self._drain_queue(collection)
+        except PyMongoError as e:
+            self.logger.warning(
+                f"MongoDB still unavailable, backlog size: {self.backlog_size} ({e})"
+            )
+            return
+
+        self.logger.info("Retry backlog drained")
+
+    def close(self) -> None:
+        """Persist documents still queued in memory to the dead-letter log"""
+        with self.lock:
+            if self.queue:
+                self._spill(list(self.queue))
+                self.queue.clear()
+
+    def _enqueue(self, document: dict) -> None:
+        with self.lock:
+            self.queue.append(document)
+            self._trim()
+
+    def _trim(self) -> None:
+        """Spill the oldest documents once the queue is full (caller holds the lock)"""
+        if len(self.queue) > self.config.RETRY_QUEUE_SIZE:
+            count = min(len(self.queue), self.config.RETRY_BATCH_SIZE)
+            self._spill([self.queue.popleft() for _ in range(count)])
+
+    def _spill(self, documents: list[dict]) -> None:
+        """Append documents to the dead-letter log (caller holds the lock)"""
+        self.dead_letter_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.dead_letter_path.open("a", encoding="utf-8") as f:
+            for document in documents:
+                f.write(json_util.dumps(document) + "\n")
+        self.dead_letter_count += len(documents)
+        self.logger.warning(
+            f"Spilled {len(documents)} documents to dead-letter log, backlog size: {self.backlog_size}"
+        )
+
+    def _drain_queue(self, collection: Collection) -> None:
+        while True:
+            # Take ownership of the batch so concurrent spills cannot touch it
+            with self.lock:
+                count = min(len(self.queue), self.config.RETRY_BATCH_SIZE)
+                batch = [self.queue.popleft() for _ in range(count)]
+                self.in_flight += count
+            if not batch:
+                return
+
+            try:
+                self._insert_many(collection, batch)
+            except PyMongoError:
+                # Give the batch back in front of anything queued meanwhile
+                with self.lock:
+                    self.queue.extendleft(reversed(batch))
+                    self._trim()
+                raise
+            finally:
+                with self.lock:
+                    self.in_flight -= count
+
+            self.logger.info(
+                f"Stored {count} buffered documents, backlog size: {self.backlog_size}"
+            )
+
+    def _drain_dead_letters(self, collection: Collection) -> None:
+        with self.lock:
+            if not self.dead_letter_count:
+                return
+            # Move the log aside so new spills go to a fresh file while draining
+            draining_path = self.dead_letter_path.with_suffix(".draining")
+            os.replace(self.dead_letter_path, draining_path)
+            pending = self.dead_letter_count
+            self.in_flight += pending
+            self.dead_letter_count = 0
+
+        stored = 0
+        with draining_path.open("r", encoding="utf-8") as f:
+            lines = (line for line in f if line.strip())
+            # Stream the log in batches to keep memory bounded
+            while batch := list(itertools.islice(lines, self.config.RETRY_BATCH_SIZE)):
+                try:
+                    self._insert_many(
+                        collection, [json_util.loads(line) for line in batch]
+                    )
+                except PyMongoError:
+                    self._restore_dead_letters(draining_path, pending, stored)
+                    raise
+                stored += len(batch)
+                pending -= len(batch)
+                with self.lock:
+                    self.in_flight -= len(batch)
+
+        draining_path.unlink()
+        self.logger.info(
+            f"Stored {stored} documents from dead-letter log, backlog size: {self.backlog_size}"
+        )
+
+    def _restore_dead_letters(
+        self, draining_path: Path, pending: int, stored: int
+    ) -> None:
+        """
+        Put a partially drained log back in place
+
+        Documents already stored are left in the file (and counted until the
+        next drain); writing them again is a duplicate-key no-op. Only
+        documents spilled during the drain are copied.
+        """
+        with self.lock:
+            if self.dead_letter_path.exists():
+                with self.dead_letter_path.open("r", encoding="utf-8") as src:
+                    with draining_path.open("a", encoding="utf-8") as dst:
+                        dst.writelines(src)
+            os.replace(draining_path, self.dead_letter_path)
+            self.in_flight -= pending
+            self.dead_letter_count += stored + pending
+
+    def _insert_many(self, collection: Collection, documents: list[dict]) -> None:
+        try:
+            collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            # Documents already stored by an earlier partial attempt are fine
+            errors = [
+                error
+                for error in e.details.get("writeErrors", [])
+                if error.get("code") != DUPLICATE_KEY_ERROR
+            ]
+            if errors:
+                self.logger.error(
+                    f"Dropping {len(errors)} documents rejected by MongoDB"
+                )
+
+    def _count_dead_letters(self) -> int:
+        # Recover a drain that was interrupted by a restart
+        draining_path = self.dead_letter_path.with_suffix(".draining")
+        if draining_path.exists():
+            with draining_path.open("r", encoding="utf-8") as src:
+                with self.dead_letter_path.open("a", encoding="utf-8") as dst:
+                    dst.writelines(src)
+            draining_path.unlink()
+
+        if not self.dead_letter_path.exists():
+            return 0
+        with self.dead_letter_path.open("r", encoding="utf-8") as f:
+            return sum(1 for line in f if line.strip())
@@ -7,51 +7,66 @@ import paho.mqtt.client as mqtt
 from pymongo.collection import Collection
 from pymongo.errors import ConnectionFailure
 
+from analytics.anomaly import AnomalyDetector
+from analytics.digest import DigestBuilder
 from common.config.mqtt_config import MQTTConfig
 from common.config.slack_config import SlackConfig
 from common.utils.logger import setup_logger
 from common.utils.mongodb_client import MongoDBClientManager
 from common.utils.mqtt_client import MQTTClient
+from common.utils.retry_buffer import RetryBuffer
+from sensor.delta import DeltaDecoder
 from sensor.model import SystemMetrics
-from slack.send_notification import send_critical_alert, send_slack_notification
+from slack.send_notification import send_critical_alert, send_slack_digest
 
 logger = setup_logger("Consumer")
 config = MQTTConfig()
 
 MONGO_COLLECTION: Collection | None = None
 MAX_RETRIES = 5
-
-NOTIFICATION_TIMER = 0.0  # Initialize to 0 so first notification sends immediately
+ANOMALY_DETECTOR = AnomalyDetector()
+RETRY_BUFFER = RetryBuffer(logger)
+DELTA_DECODER = DeltaDecoder()
+DIGEST_BUILDER = DigestBuilder(SlackConfig.SEND_DURATION_SECONDS)
 
 
 def insert_to_database(metrics: SystemMetrics) -> None:
-    """Insert metrics to MongoDB"""
-    if MONGO_COLLECTION is not None:
-        result = MONGO_COLLECTION.insert_one(metrics.to_dict())
-        logger.info(f"Stored to MongoDB with ID: {result.inserted_id}")
+    """Insert metrics to MongoDB, buffering them if MongoDB is unavailable"""
+    document = metrics.to_dict()
+    document["_id"] = metrics.document_id()
+    RETRY_BUFFER.insert(MONGO_COLLECTION, document)
+    if RETRY_BUFFER.backlog_size:
+        logger.warning(
+            f"MongoDB write buffered, backlog size: {RETRY_BUFFER.backlog_size}"
+        )
+    else:
+        logger.info(f"Stored to MongoDB with ID: {document['_id']}")
 
 
 def on_message(_client: mqtt.Client, _userdata: Any, msg: mqtt.MQTTMessage) -> None:
     """Handle incoming MQTT messages and store to MongoDB"""
-    global NOTIFICATION_TIMER
     try:
         message_json = msg.payload.decode("utf-8")
-        metrics = SystemMetrics.from_json(message_json)
+        metrics = DELTA_DECODER.decode(message_json)
+        if metrics is None:
+            logger.warning("Skipping duplicate or out-of-sequence message")
+            return
 
         logger.info(f"Metrics: {metrics}")
 
-        alert = metrics.is_critical()
+        alert = metrics.is_critical() or {}
+        anomalies = ANOMALY_DETECTOR.update(metrics)
+        if anomalies:
+            logger.warning(f"Anomaly: {anomalies}")
+            alert.update(anomalies)
         if alert:
             logger.warning(f"Alert: {alert}")
-            send_critical_alert(alert)
-
-        insert_to_database(metrics)
+            send_critical_alert(alert, metrics.hostname)
 
-        # Send Slack notification if enough time has passed
-        elapsed = time.time() - NOTIFICATION_TIMER
-        if elapsed >= SlackConfig.SEND_DURATION_SECONDS:
-            NOTIFICATION_TIMER = time.time()
-            send_slack_notification(metrics, logger)
+        # Deltas that only moved the timestamp add nothing worth storing
+        if DELTA_DECODER.changed:
+            insert_to_database(metrics)
+        DIGEST_BUILDER.add(metrics)
 
     except Exception as e:
         logger.error(f"Failed to process message: {e}")
@@ -60,8 +75,10 @@ def on_message(_client: mqtt.Client, _userdata: Any, msg: mqtt.MQTTMessage) -> N
 def start_consumer() -> None:
     global MONGO_COLLECTION
 
-    # Generate unique client ID to allow multiple consumer instances
-    client_id = f"protexai-consumer-{uuid.uuid4().hex[:8]}"
+    # A stable client ID keeps a persistent session across restarts, otherwise
+    # generate a unique one to allow multiple consumer instances
+    client_id = config.CONSUMER_CLIENT_ID or f"protexai-consumer-{uuid.uuid4().hex[:8]}"
+    clean_session = not config.CONSUMER_CLIENT_ID
 
     logger.info(
         f"MQTT Broker: {config.BROKER_HOST}:{config.BROKER_PORT} Topic: {config.TOPIC} Client ID: {client_id}"
@@ -72,26 +89,40 @@ def start_consumer() -> None:
         try:
             with (
                 MongoDBClientManager(logger) as collection,
-                MQTTClient(client_id, logger, on_message) as client,
+                MQTTClient(
+                    client_id,
+                    logger,
+                    on_message,
+                    topics=[config.TOPIC],
+                    clean_session=clean_session,
+                ),
             ):
                 MONGO_COLLECTION = collection
                 logger.info("MongoDB and MQTT connected successfully")
 
-                client.subscribe(config.TOPIC)
                 logger.info("Consumer running (Press Ctrl+C to stop)")
 
                 try:
                     while True:
+                        RETRY_BUFFER.drain(MONGO_COLLECTION)
+
+                        # Send Slack digest once the reporting window has elapsed
+                        digest = DIGEST_BUILDER.flush()
+                        if digest:
+                            send_slack_digest(digest, logger)
+
                         time.sleep(0.1)
                 except KeyboardInterrupt:
                     logger.info("Consumer stopped by user")
+                finally:
+                    RETRY_BUFFER.close()
             return
 
         except KeyboardInterrupt:
             logger.info("Consumer stopped by user")
             return
 
-        except ConnectionFailure as e:
+        except (ConnectionFailure, OSError) as e:
             if attempt < MAX_RETRIES - 1:
                 delay = 2**attempt
                 jitter = random.uniform(0, delay * 0.3)  # Upto 30% jitter
@@ -103,7 +134,7 @@ def start_consumer() -> None:
                 time.sleep(wait_time)
             else:
                 logger.error(
-                    f"Max retries reached. Consumer requires MongoDB to run. Error: {e}"
+                    f"Max retries reached. Consumer requires MongoDB and MQTT to run. Error: {e}"
                 )
                 raise
 
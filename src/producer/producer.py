@@ -1,40 +1,60 @@
-import os
 import time
 import uuid
 
 import paho.mqtt.client as mqtt
 
+from common.config.delta_config import DeltaConfig
 from common.config.mqtt_config import MQTTConfig
+from common.config.sampling_config import SamplingConfig
 from common.utils.logger import setup_logger
 from common.utils.mqtt_client import MQTTClient
+from common.utils.mqtt_publisher import MQTTPublisher
+from sensor.delta import DeltaEncoder
 from sensor.metrics import get_system_metrics
+from sensor.sampling import AdaptiveScheduler
 
 logger = setup_logger("Producer")
 config = MQTTConfig()
 
-INTERVAL = int(os.getenv("RUN_INTERVAL_SECONDS", 5))
-
 
 def publish_messages(client: mqtt.Client, topic: str | None = None) -> None:
     if topic is None:
         topic = config.TOPIC
 
+    publisher = MQTTPublisher(client, logger)
+    encoder = DeltaEncoder() if DeltaConfig.ENABLED else None
+    scheduler = AdaptiveScheduler() if SamplingConfig.ADAPTIVE else None
+
     try:
         while True:
+            started = time.monotonic()
             metrics = get_system_metrics()
-            metrics_json = metrics.to_json()
-            result = client.publish(topic, metrics_json, qos=config.QOS)
-
-            if result.rc == mqtt.MQTT_ERR_SUCCESS:
-                logger.info(f"Published: {metrics}")
+            interval = (
+                scheduler.next_interval(metrics)
+                if scheduler
+                else SamplingConfig.INTERVAL_SECONDS
+            )
+            metrics.sample_interval_seconds = interval
+            metrics_json = encoder.encode(metrics) if encoder else metrics.to_json()
+            if publisher.publish(topic, metrics_json):
+                if encoder and not encoder.is_keyframe():
+                    logger.info(f"Published delta: {metrics_json}")
+                else:
+                    logger.info(f"Published: {metrics}")
+                logger.info(f"Publisher: {publisher.stats()}")
             else:
                 logger.error("Failed to publish message")
 
-            time.sleep(INTERVAL)
+            # Keep the sampling period independent of collection time
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
 
     except KeyboardInterrupt:
         logger.info("Producer stopped by user")
 
+    finally:
+        if not publisher.flush(config.CONNECT_TIMEOUT_SECONDS):
+            logger.warning(f"Unacknowledged messages on exit: {publisher.stats()}")
+
 
 def start_producer() -> None:
     # Generate unique client ID to allow multiple producer instances
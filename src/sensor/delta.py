@@ -0,0 +1,183 @@
+import json
+import time
+from datetime import datetime
+from typing import Any
+
+from common.config.delta_config import DeltaConfig
+from sensor.model import SystemMetrics
+
+# Fields sent with every delta regardless of deadband
+ALWAYS_SENT = ("timestamp",)
+# Paths that alone do not make a sample worth storing
+BOOKKEEPING_PREFIXES = ("timestamp", "overhead.")
+
+
+def flatten(data: Any, prefix: str = "") -> dict[str, Any]:
+    """Flatten a nested document into dotted paths (list items by index)"""
+    if isinstance(data, dict):
+        items = data.items()
+    elif isinstance(data, list):
+        items = enumerate(data)
+    else:
+        return {prefix: data}
+
+    flat = {}
+    for key, value in items:
+        flat.update(flatten(value, f"{prefix}.{key}" if prefix else str(key)))
+    return flat
+
+
+def set_path(data: Any, path: str, value: Any) -> None:
+    """Set a dotted path produced by `flatten` on a nested document"""
+    parts = path.split(".")
+    for part in parts[:-1]:
+        data = data[int(part)] if isinstance(data, list) else data[part]
+    if isinstance(data, list):
+        data[int(parts[-1])] = value
+    else:
+        data[parts[-1]] = value
+
+
+class DeltaEncoder:
+    """
+    Producer side: periodic keyframes plus deltas of fields outside their deadband
+
+    Keyframes are plain `SystemMetrics` JSON. Deltas look like
+    `{"delta": true, "hostname": ..., "keyframe": ts, "seq": n,
+    "changes": {path: value}}` where `keyframe` is the timestamp of the
+    keyframe they apply to and `seq` counts the deltas since then. Keyframes
+    are sent every `KEYFRAME_INTERVAL_SECONDS` regardless of the sampling rate.
+    """
+
+    def __init__(self, config: DeltaConfig | None = None) -> None:
+        """
+        Arguments:
+            config: Delta publishing configuration (defaults to env config)
+
+        Returns:
+            None
+        """
+        self.config = config or DeltaConfig()
+        self.reference: dict[str, Any] | None = None
+        self.keyframe = ""
+        self.seq = 0
+        self.last_keyframe = 0.0
+
+    def encode(self, metrics: SystemMetrics) -> str:
+        flat = flatten(metrics.to_dict())
+
+        if (
+            self.reference is None
+            or time.monotonic() - self.last_keyframe
+            >= self.config.KEYFRAME_INTERVAL_SECONDS
+            or flat.keys() != self.reference.keys()
+        ):
+            return self._keyframe(metrics, flat)
+
+        changes = {
+            path: value
+            for path, value in flat.items()
+            if path in ALWAYS_SENT or self._changed(path, value)
+        }
+        # Compare against the last value sent so small drifts cannot accumulate
+        self.reference.update(changes)
+        self.seq += 1
+
+        return json.dumps(
+            {
+                "delta": True,
+                "hostname": metrics.hostname,
+                "keyframe": self.keyframe,
+                "seq": self.seq,
+                "changes": changes,
+            }
+        )
+
+    def is_keyframe(self) -> bool:
+        """Whether the last encoded message was a keyframe"""
+        return self.seq == 0
+
+    def _keyframe(self, metrics: SystemMetrics, flat: dict[str, Any]) -> str:
+        self.reference = flat
+        self.keyframe = metrics.timestamp
+        self.seq = 0
+        self.last_keyframe = time.monotonic()
+        return metrics.to_json()
+
+    def _changed(self, path: str, value: Any) -> bool:
+        previous = self.reference[path] if self.reference else None
+        if not isinstance(value, (int, float)) or not isinstance(
+            previous, (int, float)
+        ):
+            return value != previous
+
+        field = next(part for part in reversed(path.split(".")) if not part.isdigit())
+        return abs(value - previous) > self.config.DEADBANDS.get(field, 0.0)
+
+
+class DeltaDecoder:
+    """
+    Consumer side: rebuilds full samples from keyframes and deltas per host
+    """
+
+    def __init__(self) -> None:
+        # Host -> (current document, keyframe timestamp, last delta seq)
+        self.hosts: dict[str, tuple[dict[str, Any], str, int]] = {}
+        # Whether the last decoded message changed anything worth storing
+        self.changed = False
+
+    def decode(self, payload: str) -> SystemMetrics | None:
+        """
+        Decode a keyframe or delta message
+
+        Full samples and keyframes are deduplicated by timestamp per host and
+        deltas by keyframe and sequence number, so redelivered messages are
+        dropped before any side effect.
+
+        Returns:
+            Reconstructed metrics, or None for duplicates and for deltas that
+            cannot be applied (no keyframe seen yet or a message was lost)
+        """
+        message = json.loads(payload)
+        self.changed = False
+
+        if not message.get("delta"):
+            metrics = SystemMetrics.from_dict(message)
+            host = metrics.hostname or "unknown"
+            state = self.hosts.get(host)
+            if state is not None and not _is_newer(
+                metrics.timestamp, state[0]["timestamp"]
+            ):
+                # Redelivered (QoS 1) sample, applying it would rewind the state
+                return None
+            self.hosts[host] = (metrics.to_dict(), metrics.timestamp, 0)
+            self.changed = True
+            return metrics
+
+        host = message.get("hostname") or "unknown"
+        state = self.hosts.get(host)
+        same_keyframe = state is not None and message.get("keyframe") == state[1]
+        if same_keyframe and message["seq"] <= state[2]:
+            # Redelivered (QoS 1) delta that was already applied
+            return None
+        if not same_keyframe or message["seq"] != state[2] + 1:
+            # Lost keyframe or delta: wait for the next keyframe to resynchronise
+            self.hosts.pop(host, None)
+            return None
+
+        document, keyframe, _ = state
+        for path, value in message["changes"].items():
+            set_path(document, path, value)
+        self.hosts[host] = (document, keyframe, message["seq"])
+        self.changed = any(
+            not path.startswith(BOOKKEEPING_PREFIXES) for path in message["changes"]
+        )
+
+        return SystemMetrics.from_dict(document)
+
+
+def _is_newer(timestamp: str, current: str) -> bool:
+    try:
+        return datetime.fromisoformat(timestamp) > datetime.fromisoformat(current)
+    except ValueError:
+        return timestamp > current
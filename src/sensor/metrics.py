@@ -13,11 +13,22 @@ from sensor.model import (
     SystemMetrics,
     TemperatureSensor,
 )
+from sensor.overhead import OverheadGovernor
 
+# Prime psutil so the non-blocking calls below measure usage since the last sample
+psutil.cpu_percent(interval=None)
+psutil.cpu_percent(interval=None, percpu=True)
 
-def get_cpu_usage() -> CPUMetrics:
-    cpu_percent_total = psutil.cpu_percent(interval=5)
-    cpu_percent_per_core = psutil.cpu_percent(interval=5, percpu=True)
+
+def get_cpu_per_core_usage() -> list[float]:
+    return psutil.cpu_percent(interval=None, percpu=True)
+
+
+def get_cpu_usage(usage_per_core: list[float] | None = None) -> CPUMetrics:
+    cpu_percent_total = psutil.cpu_percent(interval=None)
+    cpu_percent_per_core = (
+        get_cpu_per_core_usage() if usage_per_core is None else usage_per_core
+    )
     cpu_freq = psutil.cpu_freq()
     cpu_count_physical = psutil.cpu_count(logical=False)
     cpu_count_logical = psutil.cpu_count(logical=True)
@@ -124,13 +135,21 @@ def get_temperature() -> list[TemperatureSensor] | None:
     return None
 
 
+GOVERNOR = OverheadGovernor()
+
+
 def get_system_metrics() -> SystemMetrics:
-    return SystemMetrics(
+    # Per-core CPU, GPU and temperatures are optional and may be degraded
+    usage_per_core = GOVERNOR.run("cpu_per_core", get_cpu_per_core_usage, True)
+    metrics = SystemMetrics(
         timestamp=datetime.now().isoformat(),
+        hostname=platform.node(),
         platform=platform.system(),
-        cpu=get_cpu_usage(),
-        gpu=get_gpu_usage(),
-        ram=get_ram_usage(),
-        disk=get_disk_usage(),
-        temperature=get_temperature(),
+        cpu=GOVERNOR.run("cpu", lambda: get_cpu_usage(usage_per_core or [])),
+        gpu=GOVERNOR.run("gpu", get_gpu_usage, True),
+        ram=GOVERNOR.run("ram", get_ram_usage),
+        disk=GOVERNOR.run("disk", get_disk_usage),
+        temperature=GOVERNOR.run("temperature", get_temperature, True),
     )
+    metrics.overhead = GOVERNOR.finish()
+    return metrics
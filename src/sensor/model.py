@@ -62,8 +62,27 @@ class TemperatureSensor(BaseModel):
         return f"{self.label} ({self.temperature_c}°C)"
 
 
+class CollectorOverhead(BaseModel):
+    cpu_ms: float = Field(..., description="Smoothed CPU time per run in ms")
+    rss_delta_kb: float = Field(..., description="RSS growth during the last run")
+    stride: int = Field(..., description="Collector runs every `stride` samples")
+    enabled: bool = Field(..., description="Whether the collector is running")
+
+
+class ProducerOverhead(BaseModel):
+    cpu_percent: float = Field(..., description="Producer CPU usage (one core)")
+    rss_mb: float = Field(..., description="Producer resident memory in MB")
+    collectors: dict[str, CollectorOverhead] = Field(
+        ..., description="Overhead per collector"
+    )
+
+    def __repr__(self) -> str:
+        return f"{self.cpu_percent}% CPU, {self.rss_mb}MB RSS"
+
+
 class SystemMetrics(BaseModel):
     timestamp: str = Field(..., description="Timestamp in ISO format")
+    hostname: str | None = Field(None, description="Hostname of the producer")
     platform: str = Field(..., description="Operating system platform")
     cpu: CPUMetrics = Field(..., description="CPU metrics")
     gpu: List[GPUMetrics] | None = Field(None, description="GPU metrics")
@@ -72,6 +91,12 @@ class SystemMetrics(BaseModel):
     temperature: List[TemperatureSensor] | None = Field(
         None, description="Temperature sensors (Linux only)"
     )
+    sample_interval_seconds: float | None = Field(
+        None, description="Sampling interval in effect when this sample was taken"
+    )
+    overhead: ProducerOverhead | None = Field(
+        None, description="Producer self-overhead"
+    )
 
     def to_json(self) -> str:
         return self.model_dump_json()
@@ -87,6 +112,23 @@ class SystemMetrics(BaseModel):
     def from_dict(cls, data: dict) -> "SystemMetrics":
         return cls.model_validate(data)
 
+    def document_id(self) -> str:
+        """Deterministic id so redelivered samples map to the same document"""
+        return f"{self.hostname or 'unknown'}:{self.timestamp}"
+
+    def metric_values(self) -> dict[str, float]:
+        """Headline value of each metric, keyed like the alerts"""
+        values = {
+            "cpu": self.cpu.usage_percent,
+            "ram": self.ram.usage_percent,
+            "disk": self.disk.usage_percent,
+        }
+        if self.gpu:
+            values["gpu"] = self.gpu[0].load_percent
+        for temp in self.temperature or []:
+            values[f"{temp.label}_temp"] = temp.temperature_c
+        return values
+
     def _set_alert(self, threshold: int) -> dict[str, float]:
         alert = {}
         if self.cpu.usage_percent > threshold:
@@ -0,0 +1,189 @@
+import resource
+import time
+from typing import Any, Callable
+
+import psutil
+
+from common.config.overhead_config import OverheadConfig
+from sensor.model import CollectorOverhead, ProducerOverhead
+
+
+class CollectorBudget:
+    """
+    Cost and schedule of a single collector
+    """
+
+    def __init__(self, name: str, degradable: bool, alpha: float) -> None:
+        """
+        Arguments:
+            name: Collector name
+            degradable: Whether the collector may be slowed down or disabled
+            alpha: Smoothing factor for the CPU time per run
+
+        Returns:
+            None
+        """
+        self.name = name
+        self.degradable = degradable
+        self.alpha = alpha
+        self.cpu_seconds = 0.0
+        self.rss_delta_bytes = 0
+        self.stride = 1
+        self.enabled = True
+        self.last_result: Any = None
+
+    @property
+    def cost(self) -> float:
+        """Average CPU seconds per sample at the current stride"""
+        return self.cpu_seconds / self.stride
+
+    def due(self, sample: int) -> bool:
+        return self.enabled and sample % self.stride == 0
+
+    def record(self, cpu_seconds: float, rss_delta_bytes: int) -> None:
+        self.rss_delta_bytes = rss_delta_bytes
+        if self.cpu_seconds == 0.0:
+            self.cpu_seconds = cpu_seconds
+        else:
+            self.cpu_seconds += self.alpha * (cpu_seconds - self.cpu_seconds)
+
+    def to_model(self) -> CollectorOverhead:
+        return CollectorOverhead(
+            cpu_ms=round(self.cpu_seconds * 1000, 2),
+            rss_delta_kb=round(self.rss_delta_bytes / 1024, 2),
+            stride=self.stride,
+            enabled=self.enabled,
+        )
+
+
+class OverheadGovernor:
+    """
+    Measures the producer's own CPU time and RSS per collector and keeps it in budget
+
+    When the producer exceeds `BUDGET_PERCENT` of one core, the most expensive
+    degradable collector runs half as often, down to every `MAX_STRIDE`
+    samples, after which it is disabled. Once overhead falls below
+    `RECOVERY_RATIO` of the budget, the cheapest degraded collector is
+    restored one step at a time.
+    """
+
+    def __init__(self, config: OverheadConfig | None = None) -> None:
+        """
+        Arguments:
+            config: Overhead budget configuration (defaults to env config)
+
+        Returns:
+            None
+        """
+        self.config = config or OverheadConfig()
+        self.process = psutil.Process()
+        self.collectors: dict[str, CollectorBudget] = {}
+        self.sample = 0
+        self.cpu_percent: float | None = None
+        self.hold = 0
+        self.last_cpu = self._cpu_time()
+        self.last_wall = time.monotonic()
+
+    def run(
+        self, name: str, collect: Callable[[], Any], degradable: bool = False
+    ) -> Any:
+        """
+        Run a collector if it is due, otherwise return its last result
+
+        Returns:
+            Collector result, the cached result if skipped, or None if disabled
+        """
+        budget = self.collectors.get(name)
+        if budget is None:
+            budget = self.collectors[name] = CollectorBudget(
+                name, degradable, self.config.EWMA_ALPHA
+            )
+
+        if not budget.enabled:
+            return None
+        if not budget.due(self.sample):
+            return budget.last_result
+
+        started, rss = self._cpu_time(), self.process.memory_info().rss
+        budget.last_result = collect()
+        budget.record(self._cpu_time() - started, self.process.memory_info().rss - rss)
+        return budget.last_result
+
+    def finish(self) -> ProducerOverhead:
+        """
+        Close the current sample: measure overhead and adjust collectors
+
+        Returns:
+            Producer overhead since the previous sample
+        """
+        cpu, wall = self._cpu_time(), time.monotonic()
+        elapsed = wall - self.last_wall
+        cpu_percent = (cpu - self.last_cpu) / elapsed * 100 if elapsed > 0 else 0.0
+        self.last_cpu, self.last_wall = cpu, wall
+        self.sample += 1
+
+        # Smooth across samples, skipped collectors make single samples bursty
+        if self.cpu_percent is None:
+            self.cpu_percent = cpu_percent
+        else:
+            self.cpu_percent += self.config.EWMA_ALPHA * (
+                cpu_percent - self.cpu_percent
+            )
+        cpu_percent = self.cpu_percent
+
+        # Let the average settle on the new schedule before adjusting again
+        if self.hold > 0:
+            self.hold -= 1
+        elif cpu_percent > self.config.BUDGET_PERCENT:
+            self.hold = self._degrade()
+        elif cpu_percent < self.config.BUDGET_PERCENT * self.config.RECOVERY_RATIO:
+            self.hold = self._restore()
+
+        return ProducerOverhead(
+            cpu_percent=round(cpu_percent, 2),
+            rss_mb=round(self.process.memory_info().rss / 1024**2, 2),
+            collectors={
+                name: budget.to_model() for name, budget in self.collectors.items()
+            },
+        )
+
+    def _degrade(self) -> int:
+        """Slow down or disable the most expensive collector, return samples to hold"""
+        candidates = [
+            budget
+            for budget in self.collectors.values()
+            if budget.degradable and budget.enabled
+        ]
+        if not candidates:
+            return 0
+
+        budget = max(candidates, key=lambda b: b.cost)
+        if budget.stride * 2 > self.config.MAX_STRIDE:
+            budget.enabled = False
+            budget.last_result = None
+        else:
+            budget.stride *= 2
+        return budget.stride * 2
+
+    def _restore(self) -> int:
+        """Speed up or re-enable the cheapest degraded collector, return samples to hold"""
+        candidates = [
+            budget
+            for budget in self.collectors.values()
+            if not budget.enabled or budget.stride > 1
+        ]
+        if not candidates:
+            return 0
+
+        budget = min(candidates, key=lambda b: b.cost)
+        if not budget.enabled:
+            budget.enabled = True
+        else:
+            budget.stride //= 2
+        return budget.stride * 2
+
+    def _cpu_time(self) -> float:
+        """CPU time of the producer including finished subprocesses (rocm-smi)"""
+        # process_time has ns resolution, psutil cpu_times only clock ticks
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return time.process_time() + children.ru_utime + children.ru_stime
@@ -0,0 +1,53 @@
+from common.config.sampling_config import SamplingConfig
+from sensor.model import CRITICAL_THRESHOLD, SystemMetrics
+
+
+class AdaptiveScheduler:
+    """
+    Picks the next sampling interval from the latest sample
+
+    Drops to `MIN_INTERVAL_SECONDS` as soon as a metric rises towards
+    `CRITICAL_THRESHOLD` or changes quickly, and otherwise backs off
+    geometrically towards `MAX_INTERVAL_SECONDS`.
+    """
+
+    def __init__(self, config: SamplingConfig | None = None) -> None:
+        """
+        Arguments:
+            config: Sampling configuration (defaults to env config)
+
+        Returns:
+            None
+        """
+        self.config = config or SamplingConfig()
+        self.interval = self.config.INTERVAL_SECONDS
+        self.last_values: dict[str, float] = {}
+
+    def next_interval(self, metrics: SystemMetrics) -> float:
+        values = metrics.metric_values()
+
+        # A metric sitting steadily near the threshold (e.g. a full-ish disk)
+        # is not approaching it, so only count values that are still rising
+        hot = any(
+            value >= CRITICAL_THRESHOLD - self.config.APPROACH_MARGIN
+            and value - self.last_values[key] >= self.config.RISE_THRESHOLD
+            for key, value in values.items()
+            if key in self.last_values
+        )
+        fast = any(
+            abs(value - self.last_values[key]) >= self.config.CHANGE_THRESHOLD
+            for key, value in values.items()
+            if key in self.last_values
+        )
+        self.last_values = values
+
+        if hot or fast:
+            self.interval = self.config.MIN_INTERVAL_SECONDS
+        else:
+            self.interval = min(
+                self.interval * self.config.BACKOFF_FACTOR,
+                self.config.MAX_INTERVAL_SECONDS,
+            )
+        self.interval = max(self.interval, self.config.MIN_INTERVAL_SECONDS)
+
+        return self.interval
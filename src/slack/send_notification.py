@@ -3,8 +3,8 @@ import logging
 from slack_sdk import WebClient
 from slack_sdk.web import SlackResponse
 
+from analytics.digest import WindowDigest
 from common.config.slack_config import SlackConfig
-from sensor.model import SystemMetrics
 
 
 def send_slack_message(
@@ -25,107 +25,89 @@ def send_slack_message(
         raise
 
 
-def send_slack_notification(
-    metrics: SystemMetrics, logger: logging.Logger | None = None
+def send_slack_digest(
+    digest: WindowDigest, logger: logging.Logger | None = None
 ) -> None:
-    """Send notification to Slack"""
+    """Send the digest of a reporting window to Slack"""
     if logger is None:
         logger = logging.getLogger("SlackNotification")
     try:
-        message_payload = format_metrics_for_slack(metrics)
-        response = send_slack_message(**message_payload)
+        response = send_slack_message(**format_digest_for_slack(digest))
 
         if not response["ok"]:
-            logger.error(f"Failed to send Slack notification: {response['error']}")
+            logger.error(f"Failed to send Slack digest: {response['error']}")
         else:
-            logger.info(f"Notification sent to Slack: {response['ts']}")
+            logger.info(f"Digest sent to Slack: {response['ts']}")
 
     except Exception as e:
-        logger.error(f"Error sending Slack notification: {e}")
+        logger.error(f"Error sending Slack digest: {e}")
 
 
-def send_critical_alert(alert: dict[str, float]) -> None:
-    message = ""
+def format_value(key: str, value: float) -> str:
+    """Format a metric value with the unit implied by its key"""
+    if key.endswith("_eta_min"):
+        return f"{value} min"
+    if key.endswith("_temp"):
+        return f"{value}°C"
+    return f"{value}%"
+
+
+def send_critical_alert(alert: dict[str, float], host: str | None = None) -> None:
+    message = f"*Host:* {host}" if host else ""
     if alert:
         for key, value in alert.items():
-            message += f"\n*{key}*: {value}%"
+            message += f"\n*{key}*: {format_value(key, value)}"
     send_slack_message(message, SlackConfig.ALERT_CHANNEL)
 
 
-def format_metrics_for_slack(metrics: SystemMetrics) -> dict:
-    """Format metrics as Slack message"""
+def format_digest_for_slack(digest: WindowDigest) -> dict:
+    """Format a window digest as Slack message"""
+    samples = sum(host.samples for host in digest.hosts)
 
-    # Format CPU info
-    cpu_text = f"*CPU:* {metrics.cpu.usage_percent}%"
-    if metrics.cpu.cores_physical:
-        cpu_text += (
-            f" ({metrics.cpu.cores_physical}P/{metrics.cpu.cores_logical}L cores)"
-        )
+    fleet_text = "\n".join(
+        f"*{key}:* {format_value(key, value)}"
+        for key, value in digest.fleet_averages().items()
+    )
 
-    # Format GPU info
-    gpu_text = "*GPU:* N/A"
-    if metrics.gpu and len(metrics.gpu) > 0:
-        gpu = metrics.gpu[0]
-        gpu_text = (
-            f"*GPU:* {gpu.load_percent}% load, {gpu.memory_usage_percent}% memory"
+    offenders = []
+    for host in digest.top_offenders(SlackConfig.DIGEST_TOP_N):
+        key, value = host.peak()
+        summary = host.metrics[key]
+        offenders.append(
+            f"*{host.hostname}* {key} max {format_value(key, value)}"
+            f" (avg {format_value(key, summary.avg)}, min {format_value(key, summary.min)})"
         )
-        if gpu.temperature_c:
-            gpu_text += f", {gpu.temperature_c}°C"
-
-    # Format RAM info
-    ram_text = f"*RAM:* {metrics.ram.used_gb:.1f}GB / {metrics.ram.total_gb:.1f}GB ({metrics.ram.usage_percent}%)"
 
-    # Format Disk info
-    disk_text = f"*Disk:* {metrics.disk.used_gb:.1f}GB / {metrics.disk.total_gb:.1f}GB ({metrics.disk.usage_percent}%)"
-
-    temps = []
-    if metrics.temperature and len(metrics.temperature) > 0:
-        for temp in metrics.temperature:
-            temps.append(f"{temp.label} {temp.temperature_c}°C")
-
-    # Create Slack blocks
     blocks = [
         {
             "type": "section",
             "text": {
                 "type": "mrkdwn",
-                "text": f"*System Metrics Report* - _{metrics.platform}_",
+                "text": f"*System Metrics Digest* - _{len(digest.hosts)} hosts, {samples} samples_",
             },
         },
         {
             "type": "section",
             "fields": [
-                {"type": "mrkdwn", "text": cpu_text},
-                {"type": "mrkdwn", "text": gpu_text},
-                {"type": "mrkdwn", "text": ram_text},
-                {"type": "mrkdwn", "text": disk_text},
-            ],
-        },
-        {
-            "type": "section",
-            "fields": [
+                {"type": "mrkdwn", "text": f"*Fleet averages*\n{fleet_text or 'N/A'}"},
                 {
                     "type": "mrkdwn",
-                    "text": f"*Termperature:* {'N/A' if not temps else '\0'}",
+                    "text": "*Top offenders*\n" + ("\n".join(offenders) or "N/A"),
                 },
-                {
-                    "type": "mrkdwn",
-                    "text": "\0",
-                },
-            ]
-            + [{"type": "mrkdwn", "text": temp} for temp in temps],
+            ],
         },
         {
             "type": "section",
             "fields": [
-                {"type": "mrkdwn", "text": f"*Time:* {metrics.timestamp}"},
+                {"type": "mrkdwn", "text": f"*From:* {digest.start}"},
+                {"type": "mrkdwn", "text": f"*To:* {digest.end}"},
             ],
         },
     ]
 
     return {
         "channel": SlackConfig.CHANNEL,
-        "text": f"System Metrics - CPU: {metrics.cpu.usage_percent}%",
+        "text": f"System Metrics Digest - {len(digest.hosts)} hosts",
         "blocks": blocks,
         "attachments": [],
     }
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from "react";
+import React, { useState, useEffect, useRef } from "react";
 import mqtt, { MqttClient } from "mqtt";
 import { Card, CardContent, CardHeader, CardTitle } from "./components/ui/card";
 import MetricCard from "./components/MetricCard";
@@ -6,6 +6,7 @@ import { getUsageColor } from "./lib/color";
 
 interface SystemMetrics {
   timestamp: string;
+  hostname?: string;
   platform: string;
   cpu: {
     usage_percent: number;
@@ -34,11 +35,45 @@ interface SystemMetrics {
   }> | null;
 }
 
+// Changed fields since the last keyframe, keyed by dotted path
+interface DeltaMessage {
+  delta: true;
+  hostname: string;
+  keyframe: string;
+  seq: number;
+  changes: Record<string, unknown>;
+}
+
+// Last reconstructed sample, its keyframe and delta sequence number of a host
+interface HostState {
+  metrics: SystemMetrics;
+  keyframe: string;
+  seq: number;
+}
+
+// Set a dotted path (list items by index) on a copy of the metrics
+const applyChanges = (
+  base: SystemMetrics,
+  changes: DeltaMessage["changes"]
+): SystemMetrics => {
+  const result = structuredClone(base);
+  Object.entries(changes).forEach(([path, value]) => {
+    const parts = path.split(".");
+    let target: any = result;
+    parts.slice(0, -1).forEach((part) => {
+      target = target[part];
+    });
+    target[parts[parts.length - 1]] = value;
+  });
+  return result;
+};
+
 function App() {
   const [metrics, setMetrics] = useState<SystemMetrics | null>(null);
   const [connected, setConnected] = useState(false);
   const [history, setHistory] = useState<SystemMetrics[]>([]);
   const [loading, setLoading] = useState(true);
+  const hosts = useRef<Record<string, HostState>>({});
 
   // Fetch initial data from API
   useEffect(() => {
@@ -79,10 +114,39 @@ function App() {
 
     client.on("message", (_topic: string, message: Buffer) => {
       try {
-        const data: SystemMetrics = JSON.parse(message.toString());
+        const data: SystemMetrics | DeltaMessage = JSON.parse(
+          message.toString()
+        );
+
+        let sample: SystemMetrics;
+        if ("delta" in data) {
+          const state = hosts.current[data.hostname];
+          if (
+            !state ||
+            data.keyframe !== state.keyframe ||
+            data.seq !== state.seq + 1
+          ) {
+            // A keyframe or delta was missed, wait for the next keyframe
+            delete hosts.current[data.hostname];
+            return;
+          }
+          sample = applyChanges(state.metrics, data.changes);
+          hosts.current[data.hostname] = {
+            ...state,
+            metrics: sample,
+            seq: data.seq,
+          };
+        } else {
+          sample = data;
+          hosts.current[data.hostname ?? "unknown"] = {
+            metrics: data,
+            keyframe: data.timestamp,
+            seq: 0,
+          };
+        }
 
-        setMetrics(data);
-        setHistory((prev) => [data, ...prev].slice(0, 10));
+        setMetrics(sample);
+        setHistory((prev) => [sample, ...prev].slice(0, 10));
       } catch (err) {
         console.error("Error parsing message:", err);
       }